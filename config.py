@@ -25,6 +25,31 @@ PAGE_CONFIG = {
     'layout': "wide"
 }
 
+# Допустимые названия колонок во входных файлах (регистр и пробелы по краям не учитываются)
+COLUMN_ALIASES = {
+    'batch_size': ['batch_size', 'batch', 'lot_size', 'qty', 'quantity',
+                   'размер партии', 'размер_партии', 'деталей'],
+    'defect_count': ['defect_count', 'defects', 'defect_qty', 'rejects', 'nok',
+                     'бракованные детали', 'брак', 'бракованных']
+}
+
+# Компактные типы колонок при чтении (nullable, чтобы пустые ячейки дошли до validate_data)
+COLUMN_DTYPES = {
+    'batch_size': 'Int32',
+    'defect_count': 'Int32'
+}
+
+# Поддерживаемые форматы: расширение -> (формат, сжатие)
+FILE_FORMATS = {
+    '.csv': ('csv', None),
+    '.csv.gz': ('csv', 'gzip'),
+    '.csv.zst': ('csv', 'zstd'),
+    '.xlsx': ('excel', None),
+    '.xls': ('excel', None),
+    '.parquet': ('parquet', None),
+    '.feather': ('feather', None)
+}
+
 def setup_fonts():
     try:
         pdfmetrics.registerFont(TTFont(
@@ -1,4 +1,5 @@
 import os
+import time
 import streamlit as st
 import numpy as np
 import pandas as pd
@@ -6,11 +7,12 @@ import matplotlib.pyplot as plt
 from scipy.stats import chi2, binom, norm, gaussian_kde
 
 from config import PAGE_CONFIG, setup_fonts
-from utils.file_handling import get_save_path, clear_data
+from utils.file_handling import get_save_path, clear_data, load_defect_files
 from utils.pdf_generator import create_pdf_report
 from utils.plotting import create_distribution_plot, create_comparison_plot
 from utils.validation import validate_data
 from utils.stats_analysis import calculate_basic_stats, perform_chi2_test_normal
+from utils.sampling_simulation import parse_plans, calculate_plan_risks, simulate_sampling_plans, simulate_lot_acceptance
 
 
 # Настройка страницы из конфига
@@ -25,33 +27,48 @@ if FONT_NAME == 'Helvetica':
 # Боковая панель для ввода данных
 with st.sidebar:
     st.header("⚙️ Ввод данных")
-    input_method = st.radio("Способ ввода:", ["Создать вручную", "Открыть CSV"])
+    input_method = st.radio("Способ ввода:", ["Создать вручную", "Открыть файлы"])
 
-    if input_method == "Открыть CSV":
-        uploaded_file = st.file_uploader("CSV с колонками 'batch_size' и 'defect_count'", 
-                                       key=f"file_uploader_{st.session_state.get('file_uploader_counter', 0)}")
-        if uploaded_file:
+    if input_method == "Открыть файлы":
+        uploaded_files = st.file_uploader("Файлы с колонками размера партии и количества брака",
+                                          type=["csv", "gz", "zst", "xlsx", "xls", "parquet", "feather"],
+                                          accept_multiple_files=True,
+                                          key=f"file_uploader_{st.session_state.get('file_uploader_counter', 0)}")
+        if uploaded_files:
             try:
-                df = pd.read_csv(uploaded_file)
-                uploaded_file.close()
-                
-                if "batch_size" in df.columns and "defect_count" in df.columns:
+                df, errors, rows_per_second = load_defect_files(uploaded_files)
+                for uploaded_file in uploaded_files:
+                    uploaded_file.close()
+                for error in errors:
+                    st.error(f"Ошибка при чтении: {error}")
+
+                if df is not None:
+                    loaded_files = len(uploaded_files) - len(errors)
+                    st.session_state.pop('sampling_simulation', None)
                     st.session_state.editable_df = pd.DataFrame({
                         'Размер партии': df["batch_size"],
                         'Бракованные детали': df["defect_count"]
                     })
                     st.session_state.csv_loaded = True
-                    st.success("CSV успешно загружен!")
+                    st.session_state.ingest_stats = {
+                        "files": loaded_files,
+                        "rows": len(df),
+                        "rows_per_second": rows_per_second
+                    }
+                    st.success(f"Загружено файлов: {loaded_files}")
                     st.session_state.file_uploader_counter = st.session_state.get('file_uploader_counter', 0) + 1
                     
                     if 'uploaded_file' in st.session_state:
                         del st.session_state.uploaded_file
-                else:
-                    st.error("Файл должен содержать колонки 'batch_size' и 'defect_count'")
             except Exception as e:
                 st.error(f"Ошибка при чтении: {e}")
-                if 'uploaded_file' in locals():
+                for uploaded_file in uploaded_files:
                     uploaded_file.close()
+
+        ingest_stats = st.session_state.get('ingest_stats')
+        if ingest_stats and st.session_state.get('csv_loaded'):
+            st.caption(f"Прочитано {ingest_stats['rows']:,} строк из {ingest_stats['files']} файлов, "
+                       f"{ingest_stats['rows_per_second']:,.0f} строк/с")
     
     if st.button("🧹 Очистить все данные", on_click=clear_data):
         st.session_state.file_uploader_counter = st.session_state.get('file_uploader_counter', 0) + 1
@@ -87,6 +104,7 @@ if input_method == "Создать вручную":
     
     if col3.button("💾 Применить"):
         if validate_data(edited_df):
+            st.session_state.pop('sampling_simulation', None)
             st.session_state.data = {
                 "batch_sizes": edited_df['Размер партии'].tolist(),
                 "defect_counts": edited_df['Бракованные детали'].tolist()
@@ -108,7 +126,7 @@ if input_method == "Создать вручную":
         except Exception as e:
             st.error(f"Ошибка при сохранении: {e}")
 
-elif input_method == "Открыть CSV" and st.session_state.get('csv_loaded'):
+elif input_method == "Открыть файлы" and st.session_state.get('csv_loaded'):
     st.header("📝 Данные производства")
     
     if 'edit_mode' not in st.session_state:
@@ -121,6 +139,7 @@ elif input_method == "Открыть CSV" and st.session_state.get('csv_loaded')
     def save_edits():
         st.session_state.edit_mode = False
         st.session_state.editable_df = st.session_state.temp_df.copy()
+        st.session_state.pop('sampling_simulation', None)
         st.session_state.data = {
             "batch_sizes": st.session_state.editable_df['Размер партии'].tolist(),
             "defect_counts": st.session_state.editable_df['Бракованные детали'].tolist()
@@ -171,6 +190,7 @@ elif input_method == "Открыть CSV" and st.session_state.get('csv_loaded')
     if not st.session_state.edit_mode:
         if st.button("💾 Применить данные для анализа"):
             if validate_data(st.session_state.editable_df):
+                st.session_state.pop('sampling_simulation', None)
                 st.session_state.data = {
                     "batch_sizes": st.session_state.editable_df['Размер партии'].tolist(),
                     "defect_counts": st.session_state.editable_df['Бракованные детали'].tolist()
@@ -272,6 +292,81 @@ if "data" in st.session_state and st.session_state.data["batch_sizes"]:
             - Размер выборки желательно ≥ 20
             """)
 
+    st.header("🎯 Планы выборочного контроля")
+    st.markdown("Оценка планов приемки (объем выборки n, приемочное число c) "
+                "по наблюдаемой средней доле брака.")
+
+    col1, col2, col3 = st.columns(3)
+    n_range = col1.slider("Объем выборки n", 1, 1000, (10, 210))
+    c_range = col2.slider("Приемочное число c", 0, 200, (0, 20))
+    ltpd = col3.number_input("Браковочный уровень (LTPD), %", min_value=0.01, max_value=100.0,
+                             value=min(max(round(avg_defect_rate * 300, 2), 1.0), 100.0)) / 100
+    col1, col2 = st.columns(2)
+    alpha = col1.number_input("Допустимый риск поставщика α", 0.001, 0.5, 0.05)
+    beta = col2.number_input("Допустимый риск потребителя β", 0.001, 0.5, 0.10)
+    plans_text = st.text_input("Сравниваемые планы (n:c через запятую)", "50:1, 80:2, 125:3")
+
+    if st.button("🧮 Рассчитать планы"):
+        plans, plan_errors = parse_plans(plans_text)
+        for error in plan_errors:
+            st.error(f"Некорректный план {error}")
+
+        sample_sizes = np.arange(n_range[0], n_range[1] + 1)
+        acceptance_numbers = np.arange(c_range[0], c_range[1] + 1)
+        start = time.perf_counter()
+        producer_risk, consumer_risk = calculate_plan_risks(
+            sample_sizes, acceptance_numbers, avg_defect_rate, ltpd)
+        elapsed = time.perf_counter() - start
+        st.caption(f"Сетка {len(sample_sizes)}×{len(acceptance_numbers)} планов рассчитана за {elapsed * 1000:.1f} мс")
+
+        suitable = np.argwhere((producer_risk <= alpha) & (consumer_risk <= beta))
+        if len(suitable):
+            # argwhere упорядочен по n, поэтому первый подходящий план - с минимальной выборкой
+            i, j = suitable[0]
+            best_plan = (int(sample_sizes[i]), int(acceptance_numbers[j]))
+            st.success(f"Минимальный план, удовлетворяющий рискам: n={best_plan[0]}, c={best_plan[1]} "
+                       f"(α={producer_risk[i, j]:.3f}, β={consumer_risk[i, j]:.3f})")
+            if best_plan not in plans:
+                plans.append(best_plan)
+        else:
+            st.warning("В заданной сетке нет плана, удовлетворяющего обоим рискам")
+
+        if plans:
+            st.session_state.sampling_simulation = simulate_sampling_plans(batch_sizes, defect_counts, plans)
+
+    simulation = st.session_state.get('sampling_simulation')
+    if simulation:
+        labels = [f"n={n}, c={c}" for n, c in simulation['plans']]
+        oc_df = pd.DataFrame(simulation['acceptance'].T, columns=labels,
+                             index=pd.Index(simulation['defect_rates'] * 100, name="% брака"))
+        st.line_chart(oc_df)
+
+        aoq_df = pd.DataFrame(simulation['aoq'].T * 100, columns=labels, index=oc_df.index)
+        with st.expander("📉 Средний выходной уровень брака (AOQ), %"):
+            st.line_chart(aoq_df)
+
+        st.dataframe(pd.DataFrame({
+            "План": labels,
+            "Pa при среднем % брака": simulation['pa_at_avg'],
+            "AOQL, %": simulation['aoq'].max(axis=1) * 100
+        }).style.format({"Pa при среднем % брака": "{:.3f}", "AOQL, %": "{:.3f}"}),
+            use_container_width=True)
+
+        with st.expander("🎲 Монте-Карло по фактическим размерам партий"):
+            col1, col2 = st.columns(2)
+            mc_plan = col1.selectbox("План", labels)
+            n_lots = col2.number_input("Число моделируемых партий", 1000, 1000000, 20000, step=1000)
+            if st.button("▶️ Запустить моделирование"):
+                n, c = simulation['plans'][labels.index(mc_plan)]
+                # Разреженная сетка долей брака достаточна для сравнения с точной кривой
+                mc_rates = simulation['defect_rates'][::10]
+                mc_pa = simulate_lot_acceptance(batch_sizes, mc_rates, n, c, n_lots=int(n_lots))
+                exact_pa = simulation['acceptance'][labels.index(mc_plan)][::10]
+                st.line_chart(pd.DataFrame({
+                    "Биномиальная модель": exact_pa,
+                    "Монте-Карло": mc_pa
+                }, index=pd.Index(mc_rates * 100, name="% брака")))
+
     # Переносим кнопку генерации PDF вне блока проверки гипотезы
     st.header("📤 Экспорт результатов")
     if st.button("🖨️ Экспорт в PDF"):
@@ -285,7 +380,7 @@ if "data" in st.session_state and st.session_state.data["batch_sizes"]:
 else:
     if input_method == "Создать вручную":
         st.info("ℹ️ Введите данные в таблицу выше и нажмите 'Сохранить данные'")
-    elif input_method == "Открыть CSV" and not st.session_state.get('csv_loaded'):
-        st.info("ℹ️ Загрузите CSV-файл через боковую панель")
+    elif input_method == "Открыть файлы" and not st.session_state.get('csv_loaded'):
+        st.info("ℹ️ Загрузите файлы с данными через боковую панель")
 
 
@@ -1,11 +1,15 @@
 # Работа с файлами
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import filedialog
 import pandas as pd
 import streamlit as st
 
+from config import COLUMN_ALIASES, COLUMN_DTYPES, FILE_FORMATS
+
 def get_save_path(default_name="defect_data.csv"):
     """Открывает диалоговое окно для выбора места сохранения файла"""
     root = tk.Tk()
@@ -28,4 +32,91 @@ def clear_data():
     st.session_state.pop('data', None)
     st.session_state.pop('editable_df', None)
     st.session_state.pop('csv_loaded', None)
-    st.success("Данные успешно очищены!")
\ No newline at end of file
+    st.session_state.pop('ingest_stats', None)
+    st.session_state.pop('sampling_simulation', None)
+    st.success("Данные успешно очищены!")
+
+
+def detect_file_format(file_name):
+    """Определяет формат и сжатие файла по расширению"""
+    name = file_name.lower()
+    # Сначала проверяем длинные расширения, чтобы '.csv.gz' не совпал с '.gz'
+    for extension in sorted(FILE_FORMATS, key=len, reverse=True):
+        if name.endswith(extension):
+            return FILE_FORMATS[extension]
+    raise ValueError(f"{file_name}: неподдерживаемый формат файла")
+
+def resolve_columns(columns, file_name=""):
+    """Сопоставляет колонки файла с 'batch_size'/'defect_count' по таблице синонимов"""
+    normalized = {str(col).lstrip('\ufeff').strip().lower(): col for col in columns}
+    mapping = {}
+    for target, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                mapping[normalized[alias]] = target
+                break
+        else:
+            raise ValueError(f"{file_name}: не найдена колонка для '{target}' "
+                             f"(допустимые названия: {', '.join(aliases)})")
+    return mapping
+
+def _read_csv(file, compression):
+    """Читает CSV только с нужными колонками и компактными типами"""
+    header = pd.read_csv(file, compression=compression, nrows=0).columns
+    mapping = resolve_columns(header, file.name)
+    file.seek(0)
+    kwargs = dict(
+        compression=compression,
+        usecols=list(mapping),
+        dtype={col: COLUMN_DTYPES[target] for col, target in mapping.items()}
+    )
+    try:
+        df = pd.read_csv(file, engine="pyarrow", **kwargs)
+    except ImportError:
+        file.seek(0)
+        df = pd.read_csv(file, engine="c", **kwargs)
+    return df.rename(columns=mapping)
+
+def _read_defect_file(file):
+    """Читает один файл и приводит его к колонкам 'batch_size'/'defect_count'"""
+    file_format, compression = detect_file_format(file.name)
+    if file_format == 'csv':
+        return _read_csv(file, compression)
+
+    if file_format == 'excel':
+        df = pd.read_excel(file)
+    elif file_format == 'parquet':
+        df = pd.read_parquet(file)
+    else:
+        df = pd.read_feather(file)
+    mapping = resolve_columns(df.columns, file.name)
+    return df[list(mapping)].rename(columns=mapping).astype(
+        {target: COLUMN_DTYPES[target] for target in mapping.values()})
+
+def load_defect_files(files, max_workers=None):
+    """Параллельно читает несколько файлов и объединяет их в одну таблицу.
+
+    Возвращает (DataFrame или None, список ошибок, скорость чтения в строках/с).
+    """
+    def read(file):
+        try:
+            return _read_defect_file(file), None
+        except Exception as e:
+            message = str(e)
+            return None, message if message.startswith(file.name) else f"{file.name}: {message}"
+
+    if not files:
+        return None, [], 0.0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(files), os.cpu_count() or 1)) as executor:
+        results = list(executor.map(read, files))
+    frames = [df for df, _ in results if df is not None]
+    errors = [error for _, error in results if error is not None]
+    if not frames:
+        return None, errors, 0.0
+
+    df = pd.concat(frames, ignore_index=True)
+    elapsed = time.perf_counter() - start
+    rows_per_second = len(df) / elapsed if elapsed > 0 else float('inf')
+    return df, errors, rows_per_second
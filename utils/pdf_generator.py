@@ -16,7 +16,7 @@ from reportlab.pdfbase.ttfonts import TTFont
 from scipy.stats import chi2, binom, norm
 import streamlit as st
 from utils.stats_analysis import perform_chi2_test_normal
-from utils.plotting import create_distribution_plot, create_comparison_plot
+from utils.plotting import create_distribution_plot, create_comparison_plot, create_oc_curve_plot
 
 def create_pdf_report():
     """Создает PDF отчет с результатами анализа"""
@@ -138,6 +138,29 @@ def create_pdf_report():
     
     story.append(Paragraph(test_result, styles['RussianNormal']))
     story.append(Spacer(1, 24))
+
+    simulation = st.session_state.get('sampling_simulation')
+    if simulation:
+        fig3 = create_oc_curve_plot(simulation)
+        add_plot_to_story(fig3, "Планы выборочного контроля")
+        plt.close(fig3)
+
+        plans_data = [["План", "Pa при среднем % брака", "AOQL, %"]]
+        for (n, c), pa, aoq in zip(simulation['plans'], simulation['pa_at_avg'], simulation['aoq']):
+            plans_data.append([f"n={n}, c={c}", f"{pa:.3f}", f"{aoq.max() * 100:.3f}"])
+
+        t = Table(plans_data)
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, -1), 'DejaVuSans'),
+            ('FONTNAME', (0, 0), (-1, 0), 'DejaVuSans-Bold'),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]))
+        story.append(t)
+        story.append(Spacer(1, 24))
     
     doc.build(story)
     
@@ -79,3 +79,19 @@ def create_distribution_plot(batch_sizes, defect_counts, avg_defect_rate):
         ax.axis('off')
         return fig
 
+
+def create_oc_curve_plot(simulation):
+    """ОС-кривые (вероятность приемки) для выбранных планов контроля"""
+    fig, ax = plt.subplots(figsize=(10, 5))
+    defect_rates = simulation['defect_rates']
+    for (n, c), pa in zip(simulation['plans'], simulation['acceptance']):
+        ax.plot(defect_rates * 100, pa, lw=2, label=f"n={n}, c={c}")
+    ax.axvline(simulation['avg_defect_rate'] * 100, color="#ef4444", linestyle='--',
+               label="Средний % брака")
+    ax.set_xlabel("Доля брака в партии, %")
+    ax.set_ylabel("Вероятность приемки")
+    ax.set_title("Оперативные характеристики планов выборочного контроля")
+    ax.set_ylim(0, 1.02)
+    ax.legend()
+    ax.grid(True, linestyle='--', alpha=0.5)
+    return fig
@@ -0,0 +1,132 @@
+# Моделирование планов выборочного контроля
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.special import bdtr
+
+from utils.stats_analysis import calculate_basic_stats
+
+
+def build_defect_rate_grid(avg_defect_rate, n_points=200, max_multiplier=5.0):
+    """Сетка долей брака от 0 до max_multiplier * средней доли брака"""
+    upper = max(avg_defect_rate * max_multiplier, 0.01)
+    return np.linspace(0.0, min(upper, 1.0), n_points)
+
+
+def parse_plans(plans_text):
+    """Разбирает строку вида "50:1, 80:2" в список планов (n, c).
+
+    Возвращает (планы, ошибки); допустимы только планы с n >= 1 и 0 <= c < n.
+    """
+    plans, errors = [], []
+    for item in plans_text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.split(":")
+        try:
+            if len(parts) != 2:
+                raise ValueError
+            n, c = int(parts[0]), int(parts[1])
+        except ValueError:
+            errors.append(f"«{item}»: план нужно указывать в формате n:c, например 50:1")
+            continue
+        if n < 1 or not 0 <= c < n:
+            errors.append(f"«{item}»: требуется n ≥ 1 и 0 ≤ c < n")
+            continue
+        plans.append((n, c))
+    return plans, errors
+
+
+def evaluate_sampling_plans(sample_sizes, acceptance_numbers, defect_rates):
+    """Вероятности приемки для всей сетки планов (n, c) и долей брака.
+
+    Возвращает массив формы (len(sample_sizes), len(acceptance_numbers), len(defect_rates)),
+    где Pa = P(X <= c), X ~ Bin(n, p). Для недопустимых планов (c >= n) значение NaN.
+    """
+    n = np.asarray(sample_sizes, dtype=np.int64)[:, None, None]
+    c = np.asarray(acceptance_numbers, dtype=np.int64)[None, :, None]
+    p = np.asarray(defect_rates, dtype=np.float64)[None, None, :]
+
+    # bdtr считает точную биномиальную CDF сразу по всей сетке; n и c должны быть целыми,
+    # иначе scipy переходит на медленную устаревшую ветку для нецелых n
+    pa = bdtr(c, n, p)
+    return np.where(c < n, pa, np.nan)
+
+
+def calculate_plan_risks(sample_sizes, acceptance_numbers, aql, ltpd):
+    """Риск поставщика (1 - Pa при AQL) и риск потребителя (Pa при LTPD) для каждого плана"""
+    pa = evaluate_sampling_plans(sample_sizes, acceptance_numbers, [aql, ltpd])
+    producer_risk = 1.0 - pa[..., 0]
+    consumer_risk = pa[..., 1]
+    return producer_risk, consumer_risk
+
+
+def _simulate_chunk(seed, lot_sizes, defect_rates, sample_size, acceptance_number, n_lots):
+    """Моделирует один блок партий и возвращает число принятых партий для каждой доли брака"""
+    rng = np.random.default_rng(seed)
+    lots = rng.choice(lot_sizes, size=n_lots)[:, None]
+    lot_defects = rng.binomial(lots, defect_rates[None, :])
+    # Выборка без возвращения из партии: число брака в выборке гипергеометрическое
+    sample = np.minimum(sample_size, lots)
+    sample = np.broadcast_to(sample, lot_defects.shape)
+    lots = np.broadcast_to(lots, lot_defects.shape)
+    sample_defects = rng.hypergeometric(lot_defects, lots - lot_defects, sample)
+    return (sample_defects <= acceptance_number).sum(axis=0)
+
+
+def simulate_lot_acceptance(batch_sizes, defect_rates, sample_size, acceptance_number,
+                            n_lots=20000, chunk_size=2000, n_workers=None, seed=None):
+    """Монте-Карло оценка вероятности приемки по реальному распределению размеров партий.
+
+    Размеры партий выбираются с возвращением из batch_sizes, блоки моделируются
+    параллельно, каждый со своим независимым генератором.
+    """
+    lot_sizes = np.asarray(batch_sizes, dtype=np.int64)
+    defect_rates = np.asarray(defect_rates, dtype=np.float64)
+    if lot_sizes.size == 0 or n_lots <= 0:
+        return np.full(defect_rates.shape, np.nan)
+
+    chunks = [chunk_size] * (n_lots // chunk_size)
+    if n_lots % chunk_size:
+        chunks.append(n_lots % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    n_workers = n_workers or min(len(chunks), os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        accepted = executor.map(
+            lambda args: _simulate_chunk(args[0], lot_sizes, defect_rates,
+                                         sample_size, acceptance_number, args[1]),
+            zip(seeds, chunks)
+        )
+        total_accepted = np.sum(list(accepted), axis=0)
+
+    return total_accepted / n_lots
+
+
+def simulate_sampling_plans(batch_sizes, defect_counts, plans, n_rates=200):
+    """ОС-кривые для выбранных планов на основе наблюдаемых данных.
+
+    plans - список пар (n, c). Возвращает словарь с сеткой долей брака,
+    вероятностями приемки, средним выходным уровнем брака (AOQ) и
+    вероятностью приемки при средней доле брака.
+    """
+    _, _, _, avg_defect_rate = calculate_basic_stats(batch_sizes, defect_counts)
+    defect_rates = build_defect_rate_grid(avg_defect_rate, n_points=n_rates)
+
+    sample_sizes = np.array([n for n, _ in plans], dtype=np.int64)[:, None]
+    acceptance_numbers = np.array([c for _, c in plans], dtype=np.int64)[:, None]
+    valid = (acceptance_numbers >= 0) & (acceptance_numbers < sample_sizes)
+    acceptance = np.where(valid, bdtr(acceptance_numbers, sample_sizes, defect_rates[None, :]), np.nan)
+    at_avg = np.where(valid, bdtr(acceptance_numbers, sample_sizes, avg_defect_rate), np.nan)[:, 0]
+
+    return {
+        'avg_defect_rate': avg_defect_rate,
+        'defect_rates': defect_rates,
+        'plans': list(plans),
+        'acceptance': acceptance,
+        'aoq': acceptance * defect_rates[None, :],
+        'pa_at_avg': at_avg,
+    }